@@ -8,29 +8,26 @@ import matplotlib as mpl
 import numpy as np
 from math import pi
 from sklearn.decomposition import PCA
-from sklearn.mixture import GaussianMixture as GMM
-from umap import UMAP
-from sklearn.cluster import KMeans
-from scipy.spatial.distance import cdist
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import make_pipeline
-from sklearn.preprocessing import LabelEncoder
 from sklearn.preprocessing import OneHotEncoder
 from datetime import date
 from warnings import filterwarnings
-import os
-import community
-
-import keras
-from keras.models import Sequential
-from keras.layers import Dense
-from keras import regularizers
-from keras.utils import np_utils
-from keras.metrics import categorical_accuracy
-from keras.layers import Dropout
-import keras.backend as K
+import zipfile
+from urllib.request import urlretrieve
+import hashlib
+from functools import lru_cache
 import scipy.stats as st
+import scipy.sparse as sparse
+import scipy.sparse.linalg
+import math
+
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
 
 
 filterwarnings('ignore')
@@ -122,17 +119,10 @@ def get_gene_data(data, gene_name_column, test_gene_list):
     * dataframe with the genes you want
     """
     
-    gene_profiles = pd.DataFrame()
-
-    for gene in data[gene_name_column].values:
-
-        if gene in test_gene_list: 
+    # Vectorized membership test over the whole column
+    mask = data[gene_name_column].isin(set(test_gene_list))
 
-            df_ = data[(data[gene_name_column] == gene)]
-
-            gene_profiles = pd.concat([gene_profiles, df_])
-    
-    gene_profiles.drop_duplicates(inplace = True)
+    gene_profiles = data.loc[mask].drop_duplicates()
     
     return gene_profiles
 
@@ -157,17 +147,14 @@ def get_df_missing_columns(data):
     
     '''
     
-    # Generate a DataFrame with the % of missing values for each column
-    df_missing_values = (data.isnull().sum(axis = 0) / len(data) * 100)\
-                        .sort_values(ascending = False)\
-                        .to_frame('% missing_values').reset_index()
-    
-    # Generate a DataFrame that indicated the data type for each column
-    df_feature_type = data.dtypes.to_frame('feature_type').reset_index()
+    # Get the % of missing values for each column in a single pass
+    missing_values = pd.Series(data.isnull().values.mean(axis = 0) * 100,
+                               index = data.columns)
     
-    # Merge frames
-    missing_cols_df = pd.merge(df_feature_type, df_missing_values, on = 'index',
-                         how = 'inner')
+    # Pair each column's data type with its % of missing values
+    missing_cols_df = pd.concat([data.dtypes.rename('feature_type'),
+                                 missing_values.rename('% missing_values')], axis = 1)\
+                        .rename_axis('index').reset_index()
 
     missing_cols_df.sort_values(['% missing_values', 'feature_type'], inplace = True)
     
@@ -180,16 +167,17 @@ def find_constant_features(data):
     """
     Get a list of the constant features in a dataframe. 
     """
-    const_features = []
-    for column in list(data.columns):
-        if data[column].unique().size < 2:
-            const_features.append(column)
+    const_features = data.columns[data.nunique(dropna = False) < 2].tolist()
     return const_features
 
 
 def duplicate_columns(frame):
     '''
     Get a list of the duplicate columns in a pandas dataframe.
+
+    Numeric columns are bucketed by a hash of their contents so that only 
+    columns sharing a hash are compared element-wise. Object columns are 
+    compared pairwise, since equal values (e.g. 1 and 1.0) can hash differently.
     '''
     groups = frame.columns.to_series().groupby(frame.dtypes).groups
     dups = []
@@ -198,41 +186,47 @@ def duplicate_columns(frame):
 
         cs = frame[v].columns
         vs = frame[v]
-        lcs = len(cs)
-
-        for i in range(lcs):
-            ia = vs.iloc[:,i].values
-            for j in range(i+1, lcs):
-                ja = vs.iloc[:,j].values
-                if np.array_equal(ia, ja):
-                    dups.append(cs[i])
-                    break
+
+        kind = getattr(t, 'kind', 'O')
+
+        if kind == 'O':
+            # A single bucket, i.e. the pairwise comparison of all columns
+            buckets = {None: list(range(len(cs)))}
+
+        else:
+            # Bucket column positions by the hash of their contents
+            buckets = {}
+            for i in range(len(cs)):
+                values = vs.iloc[:, i].values
+                if kind in 'fc':
+                    # -0.0 + 0.0 == 0.0, so that -0.0 and 0.0 hash the same
+                    values = values + 0.0
+                col_hash = pd.util.hash_array(values)
+                key = hashlib.blake2b(col_hash.tobytes()).digest()
+                buckets.setdefault(key, []).append(i)
+
+        # Confirm equality only within hash collisions
+        group_dups = []
+        for positions in buckets.values():
+            for k, i in enumerate(positions[:-1]):
+                ia = vs.iloc[:, i].values
+                for j in positions[k + 1:]:
+                    if np.array_equal(ia, vs.iloc[:, j].values):
+                        group_dups.append(i)
+                        break
+
+        dups.extend(cs[i] for i in sorted(group_dups))
+
     return dups
 
 
 def get_duplicate_columns(df):
         
     """
-    Returns a list of duplicate columns 
+    Returns a list of duplicate columns. Alias of duplicate_columns.
     """
     
-    groups = df.columns.to_series().groupby(df.dtypes).groups
-    dups = []
-
-    for t, v in groups.items():
-
-        cs = df[v].columns
-        vs = df[v]
-        lcs = len(cs)
-
-        for i in range(lcs):
-            ia = vs.iloc[:,i].values
-            for j in range(i+1, lcs):
-                ja = vs.iloc[:,j].values
-                if np.array_equal(ia, ja):
-                    dups.append(cs[i])
-                    break
-    return dups
+    return duplicate_columns(df)
 
 
 def get_df_stats(df):
@@ -253,7 +247,7 @@ def test_missing_data(df, fname):
     
     """Look for missing entries in a DataFrame."""
     
-    assert np.all(df.notnull()), fname + ' contains missing data'
+    assert not df.isnull().values.any(), fname + ' contains missing data'
 
 
 
@@ -275,13 +269,9 @@ def col_encoding(df, column):
     
     """
     
-    le = LabelEncoder()
-    
-    label_encoded = le.fit_transform(df[column].values)
+    hot = OneHotEncoder()
     
-    hot = OneHotEncoder(sparse = False)
-    
-    hot_encoded = hot.fit_transform(label_encoded.reshape(len(label_encoded), 1))
+    hot_encoded = hot.fit_transform(df[[column]]).toarray()
     
     return hot_encoded
 
@@ -299,20 +289,20 @@ def one_hot_df(df, cat_col_list):
     - cat_col_list: list of categorical columns to encode.
     
     outputs
-    - df_hot: one hot encoded subset of the original DataFrame.
+    - df_hot: one hot encoded subset of the original DataFrame (sparse columns).
     """
 
-    df_hot = pd.DataFrame()
-
-    for col in cat_col_list:     
+    hot = OneHotEncoder(dtype = np.float32)
 
-        encoded_matrix = col_encoding(df, col)
+    # Encode all of the columns at once into a sparse matrix
+    encoded_matrix = hot.fit_transform(df[cat_col_list]).tocsc()
 
-        df_ = pd.DataFrame(encoded_matrix,
-                           columns = [col+ ' ' + str(int(i))\
-                                      for i in range(encoded_matrix.shape[1])])
+    columns = [col + ' ' + str(i)
+               for col, categories in zip(cat_col_list, hot.categories_)
+               for i in range(len(categories))]
 
-        df_hot = pd.concat([df_hot, df_], axis = 1)
+    df_hot = pd.DataFrame({name: pd.arrays.SparseArray.from_spmatrix(encoded_matrix[:, i])
+                           for i, name in enumerate(columns)})
         
     return df_hot
 
@@ -333,41 +323,124 @@ def plot_kmeans(kmeans, X, n_clusters=4, rseed=0, ax=None):
 
     # plot the representation of the KMeans model
     centers = kmeans.cluster_centers_
-    radii = [cdist(X[labels == i], [center]).max()
-             for i, center in enumerate(centers)]
+    
+    # Distance of every point to its own center, reduced per cluster in one pass
+    diff = X - centers[labels]
+    radii = np.zeros(len(centers))
+    np.maximum.at(radii, labels, np.einsum('ij,ij->i', diff, diff))
+    radii = np.sqrt(radii)
+    
     for c, r in zip(centers, radii):
         ax.add_patch(plt.Circle(c, r, fc='#CCCCCC', lw=3, alpha=0.5, zorder=1))
 
 
+def _fast_clustering(G):
+    
+    """
+    Clustering coefficient of every node (in G.nodes() order) from a sparse triangle count.
+    Self-loops are ignored, as in nx.clustering. Directed graphs and multigraphs 
+    fall back to nx.clustering.
+    """
+    
+    if G.is_directed() or G.is_multigraph():
+        return np.fromiter(nx.clustering(G).values(), dtype = np.float64,
+                           count = G.number_of_nodes())
+    
+    index = {n: i for i, n in enumerate(G.nodes())}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges() if u != v],
+                     dtype = np.int64).reshape(-1, 2)
+    
+    # Symmetric binary adjacency matrix without self-loops
+    n_nodes = len(index)
+    A = sparse.coo_matrix((np.ones(2 * len(edges), dtype = np.int64),
+                           (np.r_[edges[:, 0], edges[:, 1]], np.r_[edges[:, 1], edges[:, 0]])),
+                          shape = (n_nodes, n_nodes)).tocsr()
+    
+    deg = np.asarray(A.sum(axis = 1)).ravel()
+    
+    # Number of triangles through each node: diag(A^3) / 2
+    tri = np.asarray((A @ A).multiply(A).sum(axis = 1)).ravel() / 2
+    
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        clustering = np.where(deg > 1, 2 * tri / (deg * (deg - 1)), 0.0)
+    
+    return clustering
+
+
 def net_stats(G):
     
     '''Get basic network stats and plots. Specifically degree and clustering coefficient distributions.'''
     
-    net_degree_distribution= []
+    n_nodes = G.number_of_nodes()
+
+    net_degree_distribution = np.fromiter((d for _, d in G.degree()), dtype = np.int64,
+                                          count = n_nodes)
 
-    for i in list(G.degree()):
-        net_degree_distribution.append(i[1])
+    net_clustering = _fast_clustering(G)
         
-    print("Number of nodes in the network: %d" %G.number_of_nodes())
+    print("Number of nodes in the network: %d" %n_nodes)
     print("Number of edges in the network: %d" %G.number_of_edges())
-    print("Avg node degree: %.2f" %np.mean(list(net_degree_distribution)))
-    print('Avg clustering coefficient: %.2f'%nx.cluster.average_clustering(G))
+    print("Avg node degree: %.2f" %net_degree_distribution.mean())
+    print('Avg clustering coefficient: %.2f'%net_clustering.mean())
     print('Network density: %.2f'%nx.density(G))
 
     
     fig, axes = plt.subplots(1,2, figsize = (16,4))
 
-    axes[0].hist(list(net_degree_distribution), bins=20, color = 'lightblue')
+    axes[0].hist(net_degree_distribution, bins=20, color = 'lightblue')
     axes[0].set_xlabel("Degree $k$")
     
     #axes[0].set_ylabel("$P(k)$")
     
-    axes[1].hist(list(nx.clustering(G).values()), bins= 20, color = 'lightgrey')
+    axes[1].hist(net_clustering, bins= 20, color = 'lightgrey')
     axes[1].set_xlabel("Clustering Coefficient $C$")
     #axes[1].set_ylabel("$P(k)$")
     axes[1].set_xlim([0,1])
 
 
+def _eigenvector_centrality(G):
+    
+    """
+    Eigenvector centrality of G as a {node: score} dict, like nx.eigenvector_centrality.
+    
+    Connected graphs with 3 or more nodes use the sparse ARPACK solver 
+    (scipy.sparse.linalg.eigs). Smaller, disconnected graphs and multigraphs, where 
+    the principal eigenvector is not unique or ARPACK can't be used, fall back 
+    to the networkx power iteration.
+    """
+    
+    n_nodes = G.number_of_nodes()
+    
+    connected = n_nodes > 0 and (nx.is_strongly_connected(G) if G.is_directed() 
+                                 else nx.is_connected(G))
+    
+    if n_nodes < 3 or not connected or G.is_multigraph():
+        return nx.eigenvector_centrality(G)
+    
+    nodes = list(G.nodes())
+    index = {n: i for i, n in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()],
+                     dtype = np.int64).reshape(-1, 2)
+    
+    rows, cols = edges[:, 0], edges[:, 1]
+    
+    if not G.is_directed():
+        # Both directions for every edge, self-loops once
+        not_loop = rows != cols
+        rows, cols = np.r_[rows, cols[not_loop]], np.r_[cols, rows[not_loop]]
+    
+    A = sparse.coo_matrix((np.ones(len(rows)), (rows, cols)),
+                          shape = (n_nodes, n_nodes)).tocsr()
+    
+    # Left eigenvector (in-edges), as in nx.eigenvector_centrality
+    vals, vecs = sparse.linalg.eigs(A.T, k = 1, which = 'LR')
+    
+    centrality = np.abs(vecs[:, 0].real)
+    centrality /= np.linalg.norm(centrality)
+    
+    return dict(zip(nodes, centrality))
+
+
 def get_network_hubs(ntw):
     
     """
@@ -375,9 +448,17 @@ def get_network_hubs(ntw):
     output:Prints a list of global regulator name and eigenvector centrality score pairs
     """
     
-    eigen_cen = nx.eigenvector_centrality(ntw)
+    eigen_cen = _eigenvector_centrality(ntw)
+    
+    nodes = list(eigen_cen.keys())
+    scores = np.fromiter(eigen_cen.values(), dtype = np.float64, count = len(nodes))
     
-    hubs = sorted(eigen_cen.items(), key = lambda cc:cc[1], reverse = True)[:10]
+    # Partial sort to get the top 10 hubs, then order them by score
+    k = min(10, len(nodes))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    
+    hubs = [(nodes[i], float(scores[i])) for i in top]
     
     return hubs
 
@@ -390,24 +471,37 @@ def get_network_clusters(network_lcc, n_clusters):
     output = a list with the netoworks clusters
     
     """
-    cluster_list = []
+    cluster_list = [[] for i in range(n_clusters)]
     
-    for i in range(n_clusters):
+    # Assign every node to its cluster in a single sweep
+    for n, attrs in network_lcc.nodes(data = True):
 
-        cluster_lcc = [n for n in network_lcc.nodes()\
-                       if network_lcc.node[n]['modularity'] == i]
+        i = attrs['modularity']
 
-        cluster_list.append(cluster_lcc)
+        if 0 <= i < n_clusters:
+            cluster_list[i].append(n)
 
     return cluster_list
 
+def _read_colombos_data(path):
+    
+    """
+    Read a Colombos expression compendium with the C parser, declaring the 
+    expression columns (all but the 3 annotation columns) as float32.
+    """
+    
+    header = pd.read_csv(path, sep = '\t', skiprows = 6, nrows = 0).columns
+    
+    dtypes = {col: np.float32 for col in header[3:]}
+    
+    return pd.read_csv(path, sep = '\t', skiprows = 6, engine = 'c', dtype = dtypes)
+
+
 def download_and_preprocess_data(org, data_dir = None, variance_ratio = 0.8, 
                                 output_path = '~/Downloads/'):
     
     """
     General function to download and preprocess dataset from Colombos. 
-    Might have some issues for using with Windows. If you're using windows
-    I recommend using the urllib for downloading the dataset. 
     
     Params
     -------
@@ -431,16 +525,14 @@ def download_and_preprocess_data(org, data_dir = None, variance_ratio = 0.8,
     #Check if dataset is in directory
     if data_dir is None:
         
-        download_cmd = 'wget http://colombos.net/cws_data/compendium_data/'\
-                      + org + '_compendium_data.zip'
+        zip_fname = org + '_compendium_data.zip'
         
-        unzip_cmd = 'unzip '+org +'_compendium_data.zip'
+        urlretrieve('http://colombos.net/cws_data/compendium_data/' + zip_fname, zip_fname)
         
-        os.system(download_cmd)
-        os.system(unzip_cmd)
+        with zipfile.ZipFile(zip_fname) as zf:
+            zf.extractall()
         
-        df = pd.read_csv('colombos_'+ org + '_exprdata_20151029.txt',
-                         sep = '\t', skiprows= np.arange(6))
+        df = _read_colombos_data('colombos_'+ org + '_exprdata_20151029.txt')
         
         df.rename(columns = {'Gene name': 'gene name'}, inplace = True)
         
@@ -448,7 +540,7 @@ def download_and_preprocess_data(org, data_dir = None, variance_ratio = 0.8,
         
     else: 
         
-        df = pd.read_csv(data_dir, sep = '\t', skiprows= np.arange(6))
+        df = _read_colombos_data(data_dir)
         try : 
             df.rename(columns = {'Gene name': 'gene name'}, inplace = True)
         except:
@@ -457,14 +549,15 @@ def download_and_preprocess_data(org, data_dir = None, variance_ratio = 0.8,
     data = df.iloc[:, 3:]
 
     preprocess = make_pipeline(SimpleImputer( strategy = 'median'),
-                               StandardScaler(), )
+                               StandardScaler(copy = False), )
 
-    scaled_data = preprocess.fit_transform(data)
+    # Single precision is enough for the PCA denoising and halves memory
+    scaled_data = preprocess.fit_transform(data).astype(np.float32, copy = False)
     
     # Initialize PCA object
-    pca = PCA(variance_ratio, random_state = 42).fit(scaled_data)
+    pca = PCA(variance_ratio, copy = False, random_state = 42)
     
-    # Project to PCA space
+    # Fit and project to PCA space
     projected = pca.fit_transform(scaled_data)
     
     # Reconstruct the dataset using 80% of the variance of the data 
@@ -486,15 +579,35 @@ def lower_strings(string_list):
     """
     Helper function to return lowercase version of a list of strings.
     """
-    return [str(x).lower() for x in string_list]
+    return pd.Index(string_list).astype(str).str.lower().tolist()
 
 
-def load_gene_ontology_data(): 
+@lru_cache(maxsize = 1)
+def _read_gene_ontology_data():
     
-    """Load the GO annotation dataset of E. coli K-12. """
+    """
+    Read and cache the GO annotation dataset, with lowercase gene names. GO IDs and 
+    gene names are stored as categoricals so that counts, filters and merges work 
+    on integer codes.
+    """
     
     gene_ontology_data = pd.read_csv('../data/GO_annotations_ecoli.csv')
     
+    gene_ontology_data['GO_ID'] = gene_ontology_data['GO_ID'].astype('category')
+    
+    gene_ontology_data['gene_name'] = gene_ontology_data['gene_name'].str.lower()\
+                                                                     .astype('category')
+    
+    return gene_ontology_data
+
+
+def load_gene_ontology_data(): 
+    
+    """Load the GO annotation dataset of E. coli K-12. Gene names are lowercase. """
+    
+    # Copy so that callers can't modify the cached dataset
+    gene_ontology_data = _read_gene_ontology_data().copy()
+    
     return gene_ontology_data
 
 def get_GO_gene_set(gene_ontology_data, test_gene_list):
@@ -506,7 +619,8 @@ def get_GO_gene_set(gene_ontology_data, test_gene_list):
     
     inputs~
     
-    gene_ontology_data: GO annotation dataset.
+    gene_ontology_data: GO annotation dataset with lowercase gene names, 
+                        as returned by load_gene_ontology_data.
     test_gene_list: List of genes of interest.  
     
     outputs~
@@ -514,10 +628,8 @@ def get_GO_gene_set(gene_ontology_data, test_gene_list):
     GO_gene_set:Filtered GO annotation dataset corresponding to the test gene set. 
     
     """
-    gene_ontology_data = load_gene_ontology_data()
-    
-    #Call the sortSeq library to lower the gene names
-    gene_ontology_data.gene_name = lower_strings(gene_ontology_data.gene_name.values)
+    #Lower the test gene names once before filtering
+    test_gene_list = lower_strings(test_gene_list)
     
     #Call the sortSeq library filter only the GO data from the test gene list 
     GO_gene_set = get_gene_data(gene_ontology_data, 'gene_name', test_gene_list)
@@ -545,12 +657,11 @@ def get_hi_GOs(GO_gene_set):
     #Check that GO_gene_set is not empty.
     if GO_gene_set.shape[0] > 1:
     
-        #Get the indices of the GOs that are above the threshold 
-        hi_indices = GO_gene_set.GO_ID.value_counts().values > thr
-
+        #Count the GOs once
+        GO_counts = GO_gene_set.GO_ID.value_counts()
 
         #Filter and get the GO IDs that are above threshold
-        hi_GO_ids = GO_gene_set.GO_ID.value_counts().loc[hi_indices].index.values
+        hi_GO_ids = GO_counts.index.values[GO_counts.values > thr]
         
         #Check that there are GO_IDs above the threshold
         if len(hi_GO_ids) > 0:
@@ -564,7 +675,46 @@ def get_hi_GOs(GO_gene_set):
         
         print('No enriched functions found.')
 
-def get_hyper_test_p_value(gene_ontology_data, GO_gene_set, hi_GO_ids):
+if _HAS_NUMBA:
+
+    @njit(parallel = True, cache = True)
+    def _hyper_sf(w, M, w_genome, n):
+        
+        """
+        Upper tail P(X >= w) of the hypergeometric distribution for each entry of w
+        and w_genome, summing the PMFs in log-space with log-gamma. 
+        """
+        
+        p_vals = np.empty(len(w))
+        
+        # log of the binomial coefficient C(M, n)
+        log_total = math.lgamma(M + 1) - math.lgamma(n + 1) - math.lgamma(M - n + 1)
+        
+        for i in prange(len(w)):
+            
+            wg = w_genome[i]
+            k_min = max(w[i], 0, n - (M - wg))
+            k_max = min(wg, n)
+            
+            log_sf = -np.inf
+            
+            for k in range(k_min, k_max + 1):
+                
+                # log( C(wg, k) * C(M - wg, n - k) / C(M, n) )
+                log_pmf = (math.lgamma(wg + 1) - math.lgamma(k + 1) - math.lgamma(wg - k + 1)
+                           + math.lgamma(M - wg + 1) - math.lgamma(n - k + 1)
+                           - math.lgamma(M - wg - n + k + 1) - log_total)
+                
+                # log(exp(log_sf) + exp(log_pmf))
+                hi = max(log_sf, log_pmf)
+                log_sf = hi + math.log1p(math.exp(min(log_sf, log_pmf) - hi))
+            
+            p_vals[i] = min(math.exp(log_sf), 1.0)
+        
+        return p_vals
+
+
+def get_hyper_test_p_value(gene_ontology_data, GO_gene_set, hi_GO_ids, use_numba = False):
     
     """
     Given a list of GO IDs, calculate its p-value according to the hypergeometric distribution. 
@@ -574,6 +724,8 @@ def get_hyper_test_p_value(gene_ontology_data, GO_gene_set, hi_GO_ids):
     gene_ontology_data: GO annotation dataset.
     GO_gene_set: Filtered GO annotation dataset corresponding to the test gene set. 
     hi_GO_ids: Overrepresented GO IDs. 
+    use_numba: Compute the p-values with a parallel Numba kernel if Numba is installed, 
+               otherwise fall back to scipy.stats.hypergeom. 
     
     outputs~
     
@@ -587,34 +739,17 @@ def get_hyper_test_p_value(gene_ontology_data, GO_gene_set, hi_GO_ids):
 
         M = gene_ontology_data.shape[0] # total number of balls ~ total number of annotations
 
-        p_vals = np.empty(len(hi_GO_ids))
-
-        for i, hi_GO in enumerate(hi_GO_ids):
-
-            # White balls drawn : counts of the hiGO in the GO_gene_set dataset
-            w = pd.value_counts(GO_gene_set['GO_ID'].values, sort=False)[hi_GO]
-
-            # Black balls drawn : counts of all of the GO IDs not corresponding to the specific hi_GO
-            b = GO_gene_set.shape[0] - w
-
-            # Total number of white balls in the bag : counts of the hiGO in the whole genome
-            w_genome = pd.value_counts(gene_ontology_data['GO_ID'].values, sort=False)[hi_GO]
+        # White balls drawn : counts of each hiGO in the GO_gene_set dataset
+        w = GO_gene_set['GO_ID'].value_counts().reindex(hi_GO_ids).values
 
-            # Total number of black balls in the bag : counts of non-hiGO IDs in the whole genome
-            b_genome = gene_ontology_data.shape[0] - w_genome
+        # Total number of white balls in the bag : counts of each hiGO in the whole genome
+        w_genome = gene_ontology_data['GO_ID'].value_counts().reindex(hi_GO_ids).values
 
-            #Initialize an empty array to store the PMFs values
-            hypergeom_pmfs = np.empty(n - w + 1)
-
-            #Get all of the PMFs that are >= w (overrepresentation test)
-
-            pmfs = st.hypergeom.pmf(k = np.arange(w, n+1), N = n, n = w_genome, M = M)
-
-            #P-value = PMFs >= w 
-            p_val = hypergeom_pmfs.sum()
-
-            #Store p_value in the list 
-            p_vals[i] = p_val
+        #P-value = P(X >= w), the upper tail of the hypergeometric (overrepresentation test)
+        if use_numba and _HAS_NUMBA:
+            p_vals = _hyper_sf(w.astype(np.int64), M, w_genome.astype(np.int64), n)
+        else:
+            p_vals = st.hypergeom.sf(w - 1, M, w_genome, n)
 
         #Filter the p_values < 0.05 
         significant_indices = p_vals < 0.05
@@ -636,18 +771,21 @@ def get_hyper_test_p_value(gene_ontology_data, GO_gene_set, hi_GO_ids):
         print('Enrichment test did not run.')
 
 
-def get_GO_enrichment(gene_list):
+def get_GO_enrichment(gene_list, use_numba = False):
 
     """
     Wrapper function to perform GO enrichment test. 
+    
+    use_numba: Compute the p-values with the Numba kernel if Numba is installed. 
     """
 
     go = load_gene_ontology_data()
 
-    go_gene_set = get_gene_data(go, 'gene_name', gene_list)
+    go_gene_set = get_GO_gene_set(go, gene_list)
 
     hi_go_ids = get_hi_GOs(go_gene_set)
 
-    enrichment_report = get_hyper_test_p_value(go, go_gene_set, hi_go_ids)
+    enrichment_report = get_hyper_test_p_value(go, go_gene_set, hi_go_ids, 
+                                               use_numba = use_numba)
 
     return enrichment_report
\ No newline at end of file
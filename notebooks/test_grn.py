@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+import grn
+
+
+def test_get_network_hubs_disconnected():
+
+    """Disconnected graphs fall back to the power iteration."""
+
+    G = nx.disjoint_union(nx.star_graph(5), nx.path_graph(4))
+
+    hubs = grn.get_network_hubs(G)
+
+    expected = sorted(nx.eigenvector_centrality(G).items(),
+                      key = lambda cc:cc[1], reverse = True)[:10]
+
+    assert [n for n, c in hubs][0] == expected[0][0]
+    assert np.allclose([c for n, c in hubs], [c for n, c in expected])
+
+
+def test_get_network_hubs_small_graph():
+
+    """Graphs with fewer than 3 nodes can't use ARPACK."""
+
+    hubs = grn.get_network_hubs(nx.path_graph(2))
+
+    assert np.allclose([c for n, c in hubs], [1 / np.sqrt(2)] * 2)
+
+
+def test_get_network_hubs_connected():
+
+    """The sparse solver agrees with the networkx power iteration."""
+
+    G = nx.karate_club_graph()
+
+    hubs = grn.get_network_hubs(G)
+
+    expected = sorted(nx.eigenvector_centrality(G, tol = 1e-10).items(),
+                      key = lambda cc:cc[1], reverse = True)[:10]
+
+    assert [n for n, c in hubs] == [n for n, c in expected]
+    assert np.allclose([c for n, c in hubs], [c for n, c in expected], atol = 1e-6)
+
+
+def test_duplicate_columns_matches_array_equal():
+
+    """Values that compare equal but hash differently are still duplicates."""
+
+    floats = pd.DataFrame({'a': [0.0, 1.0], 'b': [-0.0, 1.0], 'c': [np.nan, 1.0],
+                           'd': [np.nan, 1.0]})
+
+    assert grn.duplicate_columns(floats) == ['a']
+
+    objects = pd.DataFrame({'a': pd.Series([1, 2], dtype = object),
+                            'b': pd.Series([1.0, 2.0], dtype = object),
+                            'c': pd.Series([1, 2], dtype = object)})
+
+    assert grn.duplicate_columns(objects) == ['a', 'b']
+
+
+def test_col_encoding():
+
+    """col_encoding returns a dense one-hot matrix matching one_hot_df."""
+
+    df = pd.DataFrame({'a': ['x', 'y', 'x'], 'b': ['p', 'q', 'r']})
+
+    encoded = grn.col_encoding(df, 'a')
+
+    assert np.array_equal(encoded, [[1, 0], [0, 1], [1, 0]])
+    assert np.array_equal(grn.one_hot_df(df, ['a'])[['a 0', 'a 1']].sparse.to_dense().values,
+                          encoded)
+
+
+def test_get_GO_enrichment_use_numba():
+
+    """The Numba and scipy p-values agree through the enrichment wrapper."""
+
+    # Genes annotated with purine nucleotide biosynthesis (GO:0006164)
+    genes = ['prs', 'purA', 'purD', 'purF', 'purM', 'purU']
+
+    scipy_report = grn.get_GO_enrichment(genes)
+    numba_report = grn.get_GO_enrichment(genes, use_numba = True)
+
+    assert 'GO:0006164' in set(scipy_report['GO_ID'].astype(str))
+    assert np.allclose(scipy_report['p_val'], numba_report['p_val'])